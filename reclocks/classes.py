@@ -1,6 +1,8 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from nacl.signing import SigningKey, VerifyKey
+from functools import lru_cache
+from hashlib import sha256
+from nacl.signing import VerifyKey
 from reclocks.misc import (
     bytes_are_same,
     derive_point_from_scalar,
@@ -19,6 +21,83 @@ import json
 import struct
 
 
+_CHECKPOINT_INTERVAL = 1024
+_TUPLE_OR_LIST = (tuple, list)
+_FIELD_LENGTH = struct.Struct('!H')
+_VECTOR_FORMAT = b'\x01'
+
+
+@lru_cache(maxsize=16)
+def _int_and_bytes(size: int) -> struct.Struct:
+    """Returns the compiled struct for a uint32 followed by size bytes."""
+    return struct.Struct(f'!I{size}s')
+
+
+def _pack_vector(uuid: bytes, node_ids: list[bytes], clocks: dict) -> bytes:
+    """Pack a vector clock as a format byte followed by a sequence of
+        length-prefixed fields: the uuid followed by each node_id and
+        its packed clock. Clocks without state are packed as empty
+        fields.
+    """
+    fields = [uuid]
+    for id in node_ids:
+        clock = clocks[id]
+        if clock.state is not None and clock.state[1] is not None:
+            fields.extend((id, clock.pack()))
+        else:
+            fields.extend((id, b''))
+
+    for f in fields:
+        vert(len(f) <= 0xFFFF, 'uuid, node_ids, and packed clocks must be at most 65535 bytes')
+
+    return _VECTOR_FORMAT + b''.join([_FIELD_LENGTH.pack(len(f)) + f for f in fields])
+
+def _unpack_vector(data: bytes, clock_class: type) -> tuple[bytes, list[bytes], dict]:
+    """Unpack the uuid, node_ids, and clocks of a vector clock from the
+        output of _pack_vector.
+    """
+    vert(data[:1] == _VECTOR_FORMAT, 'data is not a packed vector clock')
+
+    view, offset, fields = memoryview(data), 1, []
+    while offset < len(view):
+        vert(offset + 2 <= len(view), 'data is truncated')
+        size, = _FIELD_LENGTH.unpack_from(view, offset)
+        offset += 2
+        vert(offset + size <= len(view), 'data is truncated')
+        fields.append(bytes(view[offset:offset+size]))
+        offset += size
+
+    vert(len(fields) % 2 == 1, 'data is not a packed vector clock')
+    node_ids = fields[1::2]
+    clocks = {
+        id: clock_class.unpack(packed) if packed else clock_class()
+        for id, packed in zip(node_ids, fields[2::2])
+    }
+
+    return (fields[0], node_ids, clocks)
+
+def _compare_vector_times(ts1: dict, ts2: dict) -> tuple[bool, bool]:
+    """Compare the times of every node_id shared by two vector clock
+        timestamps in a single pass. Returns whether any time in ts1 is
+        earlier and whether any time in ts1 is later than in ts2.
+    """
+    earlier = later = False
+
+    for id, state1 in ts1.items():
+        if id == b'uuid':
+            continue
+
+        state2 = ts2.get(id)
+        if state2 is None:
+            continue
+
+        if state1[0] < state2[0]:
+            earlier = True
+        elif state1[0] > state2[0]:
+            later = True
+
+    return (earlier, later)
+
 @dataclass
 class HashClockUpdater:
     """Implementation of ClockUpdaterProtocol for the Reverse Entropy
@@ -28,29 +107,68 @@ class HashClockUpdater:
     uuid: bytes
     max_time: int
 
+    def __post_init__(self) -> None:
+        # states cached along the chain; kept out of the fields
+        self._checkpoints: list[bytes] = []
+        self._segment: tuple[int, list[bytes]] = (-1, [])
+        self._cached_for: tuple[bytes, int]|None = None
+
     @classmethod
     def setup(cls, seed: bytes, max_time: int) -> HashClockUpdater:
         """Set up a new instance."""
-        state = recursive_hash(seed, max_time)
+        checkpoints, state = cls._build_checkpoints(seed, max_time)
 
-        return cls(seed=seed, uuid=state, max_time=max_time)
+        updater = cls(seed=seed, uuid=state, max_time=max_time)
+        updater._checkpoints = checkpoints
+        updater._cached_for = (seed, max_time)
+
+        return updater
 
     def advance(self, time: int) -> tuple[int, bytes]:
         """Create an update that advances the clock to the given time."""
         tert(type(time) is int, 'time must be int <= max_time')
         vert(time <= self.max_time, 'time must be int <= max_time')
 
-        state = recursive_hash(self.seed, self.max_time - time)
+        # rebuild the cached states if they were made for another chain
+        if self._cached_for != (self.seed, self.max_time):
+            self._checkpoints, _ = self._build_checkpoints(self.seed, self.max_time)
+            self._segment = (-1, [])
+            self._cached_for = (self.seed, self.max_time)
 
-        return (time, state)
+        # start from the nearest checkpoint on the way from the seed
+        count = self.max_time - time
+        index = min(count // _CHECKPOINT_INTERVAL, len(self._checkpoints) - 1)
+        offset = count - index * _CHECKPOINT_INTERVAL
+        if offset >= _CHECKPOINT_INTERVAL:
+            return (time, recursive_hash(self._checkpoints[index], offset))
+
+        # keep the states hashed from the checkpoint for nearby times
+        if self._segment[0] != index:
+            self._segment = (index, [self._checkpoints[index]])
+        states = self._segment[1]
+        while len(states) <= offset:
+            states.append(sha256(states[-1]).digest())
+
+        return (time, states[offset])
+
+    @staticmethod
+    def _build_checkpoints(seed: bytes, max_time: int) -> tuple[list[bytes], bytes]:
+        """Hash the seed max_time times, keeping every intermediate
+            state that is a multiple of the checkpoint interval away
+            from the seed. Returns the checkpoints and the final state.
+        """
+        checkpoints, state = [seed], seed
+        intervals, remainder = divmod(max(max_time, 0), _CHECKPOINT_INTERVAL)
+
+        for _ in range(intervals):
+            state = recursive_hash(state, _CHECKPOINT_INTERVAL)
+            checkpoints.append(state)
+
+        return (checkpoints, recursive_hash(state, remainder))
 
     def pack(self) -> bytes:
         """Pack the clock updater into bytes."""
-        return struct.pack(
-            f'!I{len(self.seed)}s',
-            self.max_time,
-            self.seed
-        )
+        return _int_and_bytes(len(self.seed)).pack(self.max_time, self.seed)
 
     @classmethod
     def unpack(cls, data: bytes) -> HashClockUpdater:
@@ -58,7 +176,7 @@ class HashClockUpdater:
         tert(type(data) is bytes, 'data must be bytes with len > 6')
         vert(len(data) > 6, 'data must be bytes with len > 6')
 
-        max_time, seed = struct.unpack(f'!I{len(data)-4}s', data)
+        max_time, seed = _int_and_bytes(len(data) - 4).unpack(data)
 
         return cls.setup(seed, max_time)
 
@@ -70,6 +188,10 @@ class HashClock:
     state: tuple[int, bytes] = field(default=None)
     updater: HashClockUpdater = field(default=None)
 
+    def __post_init__(self) -> None:
+        # verified (time -> state) checkpoints; kept out of the fields
+        self._checkpoints: dict[int, bytes] = {}
+
     def setup(self, max_time: int, seed_size: int = 16) -> HashClockUpdater|None:
         """Set up the instance if it hasn't been set up yet and return
             the updater for the clock. If it has been set up (i.e. has a
@@ -120,7 +242,7 @@ class HashClock:
 
     def update(self, state: tuple[int, bytes]) -> HashClock:
         """Update the clock if the state verifies."""
-        tert(type(state) in (tuple, list),
+        tert(type(state) in _TUPLE_OR_LIST,
             'states must be tuple or list of (int, bytes)')
         tert(type(self.uuid) is bytes, 'cannot update clock without valid uuid')
 
@@ -129,9 +251,16 @@ class HashClock:
             return self
 
         # verify the update maps back to the most recent state
-        if self.verify_timestamp(state):
+        if self._verify_timestamp(state, record=True):
+            previous = self.state
             self.state = tuple(state)
 
+            # keep the new state as a checkpoint in place of the old one
+            self._checkpoints[self.state[0]] = self.state[1]
+            if previous and previous[0] % _CHECKPOINT_INTERVAL and \
+                    self._checkpoints.get(previous[0]) == previous[1]:
+                del self._checkpoints[previous[0]]
+
         return self
 
     def verify(self) -> bool:
@@ -139,28 +268,76 @@ class HashClock:
         if self.state is None:
             return True
 
-        calc_state = recursive_hash(self.state[1], self.state[0])
-
-        return bytes_are_same(calc_state, self.uuid)
+        return self._verify_chain(self.state[0], self.state[1], record=True)
 
     def verify_timestamp(self, timestamp: tuple[int, bytes]) -> bool:
         """Verifies the timestamp is valid for this clock."""
+        return self._verify_timestamp(timestamp, record=False)
+
+    def _verify_timestamp(self, timestamp: tuple[int, bytes], record: bool) -> bool:
+        """Verifies the timestamp, recording checkpoints along its chain
+            only if record is True.
+        """
         if type(timestamp) is not tuple or len(timestamp) < 2:
             return False
         if type(timestamp[1]) is not bytes or len(timestamp[1]) == 0:
             return False
 
-        calc_state = recursive_hash(timestamp[1], timestamp[0])
+        return self._verify_chain(timestamp[0], timestamp[1], record)
 
-        return bytes_are_same(calc_state, self.uuid)
+    def _verify_chain(self, time: int, state: bytes, record: bool) -> bool:
+        """Verifies that state hashes to the uuid in time steps. Hashing
+            stops at the nearest verified checkpoint at or below time.
+            If record is True, the intermediate states at each
+            checkpoint interval are recorded once the chain verifies.
+            Only record when state is or will become the clock's current
+            state, so that no state after the current time is kept.
+        """
+        anchor, anchor_state = self._nearest_checkpoint(time)
+        found = {}
+        if time - anchor == 1:
+            # single tick updates are the common case
+            return bytes_are_same(sha256(state).digest(), anchor_state)
+
+        while time > anchor:
+            stop = max(anchor, (time - 1) // _CHECKPOINT_INTERVAL * _CHECKPOINT_INTERVAL)
+            state = recursive_hash(state, time - stop)
+            time = stop
+            if time > anchor:
+                found[time] = state
+
+        if not bytes_are_same(state, anchor_state):
+            return False
+
+        if record:
+            self._checkpoints.update(found)
+        return True
+
+    def _nearest_checkpoint(self, time: int) -> tuple[int, bytes]:
+        """Returns the verified checkpoint (time, state) nearest to but
+            not above the given time. Checkpoints recorded for a
+            different uuid are discarded.
+        """
+        checkpoints = self._checkpoints
+        if checkpoints.get(0) != self.uuid:
+            checkpoints.clear()
+            checkpoints[0] = self.uuid
+
+        if time <= 0:
+            return (0, self.uuid)
+
+        # updates usually arrive shortly after the current verified state
+        state = self.state
+        if state and state[0] <= time < state[0] + _CHECKPOINT_INTERVAL and \
+                checkpoints.get(state[0]) == state[1]:
+            return state
+
+        anchor = max(t for t in checkpoints if t <= time)
+        return (anchor, checkpoints[anchor])
 
     def pack(self) -> bytes:
         """Pack the clock down to bytes."""
-        return struct.pack(
-            f'!I{len(self.state[1])}s',
-            self.state[0],
-            self.state[1]
-        )
+        return _int_and_bytes(len(self.state[1])).pack(self.state[0], self.state[1])
 
     @classmethod
     def unpack(cls, data: bytes) -> HashClock:
@@ -168,10 +345,13 @@ class HashClock:
         tert(type(data) is bytes, 'data must be bytes with len > 4')
         vert(len(data) > 4, 'data must be bytes with len > 4')
 
-        time, state = struct.unpack(f'!I{len(data)-4}s', data)
-        calc_state = recursive_hash(state, time)
+        time, state = _int_and_bytes(len(data) - 4).unpack(data)
+        clock = cls(uuid=recursive_hash(state, time), state=(time, state))
 
-        return cls(uuid=calc_state, state=(time, state))
+        # the uuid is derived from the state, so the state is verified
+        clock._checkpoints.update({0: clock.uuid, time: state})
+
+        return clock
 
     def __repr__(self) -> str:
         return f'time={self.read()[0]}; uuid={self.uuid.hex()}; ' + \
@@ -250,6 +430,7 @@ class VectorHashClock:
             uuid = recursive_hash(state[1], state[0])
             self.clocks[node_id].uuid = uuid
             self.clocks[node_id].state = state
+            self.clocks[node_id]._checkpoints = {0: uuid, state[0]: state[1]}
 
         update = {b'uuid': self.uuid}
         for nid in self.node_ids:
@@ -270,19 +451,24 @@ class VectorHashClock:
         vert(b'uuid' in state, 'state must include uuid of clock to update')
         vert(bytes_are_same(state[b'uuid'], self.uuid), 'uuid of update must match clock uuid')
 
-        for id in state:
-            vert(id in self.node_ids or id == b'uuid', 'state includes invalid node_id')
+        vert(not (state.keys() - self.node_ids - {b'uuid'}),
+            'state includes invalid node_id')
 
-        for id in state:
-            if id == b'uuid' or state[id][1] is None:
+        for id, ts in state.items():
+            if id == b'uuid' or ts[1] is None:
                 continue
 
-            if self.clocks[id].state is None:
-                uuid = recursive_hash(state[id][1], state[id][0])
-                self.clocks[id].uuid = uuid
-                self.clocks[id].state = (0, uuid)
+            clock = self.clocks[id]
+            if clock.state is None:
+                # the uuid is derived from this state, so record it as
+                # verified like unpack does instead of hashing it again
+                uuid = recursive_hash(ts[1], ts[0])
+                clock.uuid = uuid
+                clock.state = tuple(ts) if ts[0] > 0 else (0, uuid)
+                clock._checkpoints = {0: uuid, clock.state[0]: clock.state[1]}
+                continue
 
-            self.clocks[id].update(state[id])
+            clock.update(ts)
 
         return self
 
@@ -321,16 +507,23 @@ class VectorHashClock:
         vert(not VectorHashClock.are_incomparable(ts1, ts2),
             'incomparable timestamps cannot be compared for happens-before relation')
 
-        reverse_causality = False
         at_least_one_earlier = False
 
-        for id in [id for id in ts1 if id in ts2 and id != b'uuid']:
-            if ts1[id][0] > ts2[id][0]:
-                reverse_causality = True
-            if ts1[id][0] < ts2[id][0]:
+        for id, state1 in ts1.items():
+            if id == b'uuid':
+                continue
+
+            state2 = ts2.get(id)
+            if state2 is None:
+                continue
+
+            if state1[0] > state2[0]:
+                # reverse causality
+                return False
+            if state1[0] < state2[0]:
                 at_least_one_earlier = True
 
-        return at_least_one_earlier and not reverse_causality
+        return at_least_one_earlier
 
     @staticmethod
     def are_incomparable(ts1: dict, ts2: dict) -> bool:
@@ -342,18 +535,12 @@ class VectorHashClock:
         tert(type(ts2) is dict, 'ts2 must be dict mapping node_id to tuple[int, bytes]')
         vert(b'uuid' in ts1 and b'uuid' in ts2, 'ts1 and ts2 must have both have uuids')
 
-        if not bytes_are_same(ts1[b'uuid'], ts2[b'uuid']):
+        # the vector clock uuid is a public identifier, so it does not
+        # need a timing-safe comparison
+        if ts1[b'uuid'] != ts2[b'uuid']:
             return True
 
-        for id in ts1:
-            if id in ts2:
-                return False
-
-        for id in ts2:
-            if id in ts1:
-                return False
-
-        return True
+        return ts1.keys().isdisjoint(ts2.keys())
 
     @staticmethod
     def are_concurrent(ts1: dict, ts2: dict) -> bool:
@@ -361,11 +548,25 @@ class VectorHashClock:
         vert(not VectorHashClock.are_incomparable(ts1, ts2),
             'incomparable timestamps cannot be compared for concurrency')
 
-        return not VectorHashClock.happens_before(ts1, ts2) and \
-            not VectorHashClock.happens_before(ts2, ts1)
+        # concurrent unless exactly one direction has an earlier time
+        earlier, later = _compare_vector_times(ts1, ts2)
+        return earlier == later
 
     def pack(self) -> bytes:
         """Pack the clock into bytes."""
+        return _pack_vector(self.uuid, self.node_ids, self.clocks)
+
+    @classmethod
+    def unpack(cls, data: bytes) -> VectorHashClock:
+        """Unpack a clock from bytes."""
+        tert(type(data) is bytes, 'data must be bytes')
+
+        uuid, node_ids, clocks = _unpack_vector(data, HashClock)
+
+        return cls(uuid, node_ids, clocks)
+
+    def pack_json(self) -> bytes:
+        """Pack the clock into the JSON format used by earlier versions."""
         jsonified = {'uuid': self.uuid.hex()}
 
         for id in self.node_ids:
@@ -377,8 +578,8 @@ class VectorHashClock:
         return bytes(json.dumps(jsonified, sort_keys=True, separators=(',', ':')), 'utf-8')
 
     @classmethod
-    def unpack(cls, data: bytes) -> VectorHashClock:
-        """Unpack a clock from bytes."""
+    def unpack_json(cls, data: bytes) -> VectorHashClock:
+        """Unpack a clock from the JSON format used by earlier versions."""
         tert(type(data) is bytes, 'data must be bytes')
 
         data = json.loads(str(data, 'utf-8'))
@@ -410,21 +611,36 @@ class PointClockUpdater:
     uuid: bytes
     max_time: int
 
+    def __post_init__(self) -> None:
+        # (seed, scalar, point) at the base of the chain; not a field
+        self._base: tuple[bytes, bytes, bytes]|None = None
+
     @classmethod
     def setup(cls, seed: bytes, max_time: int) -> PointClockUpdater:
         """Set up a new instance."""
-        skey = SigningKey(H_small(seed))
-        state = recursive_next_point(bytes(skey.verify_key), max_time)
+        updater = cls(seed=seed, uuid=None, max_time=max_time)
+        _, point = updater._base_scalar_and_point()
+        updater.uuid = recursive_next_point(point, max_time)
 
-        return cls(seed=seed, uuid=state, max_time=max_time)
+        return updater
+
+    def _base_scalar_and_point(self) -> tuple[bytes, bytes]:
+        """Returns the scalar and point at the base of the chain,
+            deriving them again if the seed has changed.
+        """
+        if self._base is None or self._base[0] != self.seed:
+            scalar = derive_key_from_seed(H_small(self.seed))
+            self._base = (self.seed, scalar, derive_point_from_scalar(scalar))
+
+        return self._base[1:]
 
     def advance(self, time: int) -> tuple[int, bytes]:
         """Create an update that advances the clock to the given time."""
         tert(type(time) is int, 'time must be int <= max_time')
         vert(time <= self.max_time, 'time must be int <= max_time')
 
-        skey = SigningKey(H_small(self.seed))
-        state = recursive_next_point(bytes(skey.verify_key), self.max_time - time)
+        _, point = self._base_scalar_and_point()
+        state = recursive_next_point(point, self.max_time - time)
 
         return (time, state)
 
@@ -438,19 +654,15 @@ class PointClockUpdater:
         tert(type(message) is bytes, 'message must be bytes')
         vert(len(message) > 0, 'message must not be empty')
 
-        x = derive_key_from_seed(H_small(self.seed))
-        x = recursive_next_scalar(x, self.max_time - time)
+        scalar, _ = self._base_scalar_and_point()
+        x = recursive_next_scalar(scalar, self.max_time - time)
         X = derive_point_from_scalar(x)
-        sig = sign_with_scalar(x, message, self.seed)
+        sig = sign_with_scalar(x, message, self.seed, X)
         return (time, X, sig)
 
     def pack(self) -> bytes:
         """Pack the clock updater into bytes."""
-        return struct.pack(
-            f'!I{len(self.seed)}s',
-            self.max_time,
-            self.seed
-        )
+        return _int_and_bytes(len(self.seed)).pack(self.max_time, self.seed)
 
     @classmethod
     def unpack(cls, data: bytes) -> PointClockUpdater:
@@ -458,7 +670,7 @@ class PointClockUpdater:
         tert(type(data) is bytes, 'data must be bytes with len > 6')
         vert(len(data) > 6, 'data must be bytes with len > 6')
 
-        max_time, seed = struct.unpack(f'!I{len(data)-4}s', data)
+        max_time, seed = _int_and_bytes(len(data) - 4).unpack(data)
 
         return cls.setup(seed, max_time)
 
@@ -470,6 +682,10 @@ class PointClock:
     state: tuple[int, bytes] = field(default=None)
     updater: PointClockUpdater = field(default=None)
 
+    def __post_init__(self) -> None:
+        # last verified (uuid, time, point); kept out of the fields
+        self._anchor: tuple[bytes, int, bytes]|None = None
+
     def setup(self, max_time: int, seed_size: int = 32) -> PointClockUpdater|None:
         """Set up the instance if it hasn't been setup yet and return
             the updater for the clock. If it has been setup (i.e. has a
@@ -512,7 +728,7 @@ class PointClock:
 
     def update(self, state: tuple[int, bytes]) -> PointClock:
         """Update the clock if the state verifies."""
-        tert(type(state) in (tuple, list),
+        tert(type(state) in _TUPLE_OR_LIST,
             'states must be tuple or list of (int, bytes)')
         tert(type(self.uuid) is bytes, 'cannot update clock without valid uuid')
 
@@ -523,6 +739,7 @@ class PointClock:
         # verify the update maps back to the most recent state
         if self.verify_timestamp(state):
             self.state = tuple(state)
+            self._anchor = (self.uuid, self.state[0], self.state[1])
 
         return self
 
@@ -532,8 +749,9 @@ class PointClock:
             return True
 
         try:
-            calc_state = recursive_next_point(self.state[1], self.state[0])
-            return bytes_are_same(calc_state, self.uuid)
+            anchor_time, anchor_point = self._nearest_anchor(self.state[0])
+            calc_state = recursive_next_point(self.state[1], self.state[0] - anchor_time)
+            return bytes_are_same(calc_state, anchor_point)
         except:
             return False
 
@@ -547,11 +765,22 @@ class PointClock:
         # check that it is a valid point for the entropy clock
         time, point = timestamp[0], timestamp[1]
         try:
-            calc_point = recursive_next_point(point, time)
-            return bytes_are_same(calc_point, self.uuid)
+            anchor_time, anchor_point = self._nearest_anchor(time)
+            calc_point = recursive_next_point(point, time - anchor_time)
+            return bytes_are_same(calc_point, anchor_point)
         except:
             return False
 
+    def _nearest_anchor(self, time: int) -> tuple[int, bytes]:
+        """Returns the most recently verified (time, point) if it is not
+            above the given time, otherwise (0, uuid).
+        """
+        anchor = self._anchor
+        if anchor is not None and anchor[0] == self.uuid and 0 < anchor[1] <= time:
+            return anchor[1:]
+
+        return (0, self.uuid)
+
     def verify_signed_timestamp(self, timestamp: tuple, message: bytes) -> bool:
         """Verify a signed timestamp contains both a valid timestamp and
             a valid signature from the pubkey in the timestamp.
@@ -559,25 +788,28 @@ class PointClock:
         tert(type(timestamp) is tuple, 'timestamp must be tuple of (int, bytes, bytes)')
         vert(len(timestamp) >= 3, 'timestamp must be tuple of (int, bytes, bytes)')
 
-        if not self.verify_timestamp(timestamp[:2]):
+        # verify the signature first since it is cheaper than the chain
+        _, point, signature = timestamp[:3]
+        if not PointClock.verify_signatures([(point, message, signature)]):
             return False
 
-        # verify the signature
-        _, point, signature = timestamp
+        return self.verify_timestamp(timestamp[:2])
+
+    @staticmethod
+    def verify_signatures(items: list[tuple[bytes, bytes, bytes]]) -> bool:
+        """Verify a batch of (point, message, signature) tuples. Returns
+            False if any signature does not verify for its point.
+        """
         try:
-            vkey = VerifyKey(point)
-            vkey.verify(message, signature)
+            for point, message, signature in items:
+                VerifyKey(point).verify(message, signature)
             return True
         except:
             return False
 
     def pack(self) -> bytes:
         """Pack the clock down to bytes."""
-        return struct.pack(
-            f'!I{len(self.state[1])}s',
-            self.state[0],
-            self.state[1]
-        )
+        return _int_and_bytes(len(self.state[1])).pack(self.state[0], self.state[1])
 
     @classmethod
     def unpack(cls, data: bytes) -> PointClock:
@@ -585,7 +817,7 @@ class PointClock:
         tert(type(data) is bytes, 'data must be bytes with len > 4')
         vert(len(data) > 4, 'data must be bytes with len > 4')
 
-        time, state = struct.unpack(f'!I{len(data)-4}s', data)
+        time, state = _int_and_bytes(len(data) - 4).unpack(data)
         calc_state = recursive_next_point(state, time)
 
         return cls(uuid=calc_state, state=(time, state))
@@ -665,6 +897,7 @@ class VectorPointClock:
             uuid = recursive_next_point(state[1], state[0])
             self.clocks[node_id].uuid = uuid
             self.clocks[node_id].state = state
+            self.clocks[node_id]._anchor = (uuid, state[0], state[1])
 
         update = {b'uuid': self.uuid}
         for nid in self.node_ids:
@@ -685,19 +918,24 @@ class VectorPointClock:
         vert(b'uuid' in state, 'state must include uuid of clock to update')
         vert(bytes_are_same(state[b'uuid'], self.uuid), 'uuid of update must match clock uuid')
 
-        for id in state:
-            vert(id in self.node_ids or id == b'uuid', 'state includes invalid node_id')
+        vert(not (state.keys() - self.node_ids - {b'uuid'}),
+            'state includes invalid node_id')
 
-        for id in state:
-            if id == b'uuid' or state[id][1] is None:
+        for id, ts in state.items():
+            if id == b'uuid' or ts[1] is None:
                 continue
 
-            if self.clocks[id].state is None:
-                uuid = recursive_next_point(state[id][1], state[id][0])
-                self.clocks[id].uuid = uuid
-                self.clocks[id].state = (0, uuid)
+            clock = self.clocks[id]
+            if clock.state is None:
+                # the uuid is derived from this state, so record it as
+                # verified like unpack does instead of hashing it again
+                uuid = recursive_next_point(ts[1], ts[0])
+                clock.uuid = uuid
+                clock.state = tuple(ts) if ts[0] > 0 else (0, uuid)
+                clock._anchor = (uuid, clock.state[0], clock.state[1])
+                continue
 
-            self.clocks[id].update(state[id])
+            clock.update(ts)
 
         return self
 
@@ -735,20 +973,24 @@ class VectorPointClock:
         if b'uuid' not in timestamp or timestamp[b'uuid'] != self.uuid:
             return False
 
-        found_signed_timestamp = False
-        for id in [id for id in timestamp if id != b'uuid']:
-            if id not in self.node_ids:
+        ids = [id for id in timestamp if id != b'uuid']
+        for id in ids:
+            if id not in self.node_ids or type(timestamp[id]) is not tuple:
                 return False
 
+        # verify all signatures before walking any of the point chains
+        signed = [
+            (timestamp[id][1], message, timestamp[id][2])
+            for id in ids if len(timestamp[id]) == 3
+        ]
+        if signed and not PointClock.verify_signatures(signed):
+            return False
+
+        for id in ids:
             if not self.clocks[id].verify_timestamp(timestamp[id]):
                 return False
 
-            if len(timestamp[id]) == 3:
-                found_signed_timestamp = True
-                if not self.clocks[id].verify_signed_timestamp(timestamp[id], message):
-                    return False
-
-        vert(found_signed_timestamp, 'timetstamp did not include a signature')
+        vert(len(signed) > 0, 'timetstamp did not include a signature')
         return True
 
     @staticmethod
@@ -762,16 +1004,23 @@ class VectorPointClock:
         vert(not VectorPointClock.are_incomparable(ts1, ts2),
             'incomparable timestamps cannot be compared for happens-before relation')
 
-        reverse_causality = False
         at_least_one_earlier = False
 
-        for id in [id for id in ts1 if id in ts2 and id != b'uuid']:
-            if ts1[id][0] > ts2[id][0]:
-                reverse_causality = True
-            if ts1[id][0] < ts2[id][0]:
+        for id, state1 in ts1.items():
+            if id == b'uuid':
+                continue
+
+            state2 = ts2.get(id)
+            if state2 is None:
+                continue
+
+            if state1[0] > state2[0]:
+                # reverse causality
+                return False
+            if state1[0] < state2[0]:
                 at_least_one_earlier = True
 
-        return at_least_one_earlier and not reverse_causality
+        return at_least_one_earlier
 
     @staticmethod
     def are_incomparable(ts1: dict, ts2: dict) -> bool:
@@ -783,18 +1032,12 @@ class VectorPointClock:
         tert(type(ts2) is dict, 'ts2 must be dict mapping node_id to tuple[int, bytes]')
         vert(b'uuid' in ts1 and b'uuid' in ts2, 'ts1 and ts2 must have both have uuids')
 
-        if not bytes_are_same(ts1[b'uuid'], ts2[b'uuid']):
+        # the vector clock uuid is a public identifier, so it does not
+        # need a timing-safe comparison
+        if ts1[b'uuid'] != ts2[b'uuid']:
             return True
 
-        for id in ts1:
-            if id in ts2:
-                return False
-
-        for id in ts2:
-            if id in ts1:
-                return False
-
-        return True
+        return ts1.keys().isdisjoint(ts2.keys())
 
     @staticmethod
     def are_concurrent(ts1: dict, ts2: dict) -> bool:
@@ -802,11 +1045,25 @@ class VectorPointClock:
         vert(not VectorPointClock.are_incomparable(ts1, ts2),
             'incomparable timestamps cannot be compared for concurrency')
 
-        return not VectorPointClock.happens_before(ts1, ts2) and \
-            not VectorPointClock.happens_before(ts2, ts1)
+        # concurrent unless exactly one direction has an earlier time
+        earlier, later = _compare_vector_times(ts1, ts2)
+        return earlier == later
 
     def pack(self) -> bytes:
         """Pack the clock into bytes."""
+        return _pack_vector(self.uuid, self.node_ids, self.clocks)
+
+    @classmethod
+    def unpack(cls, data: bytes) -> VectorPointClock:
+        """Unpack a clock from bytes."""
+        tert(type(data) is bytes, 'data must be bytes')
+
+        uuid, node_ids, clocks = _unpack_vector(data, PointClock)
+
+        return cls(uuid, node_ids, clocks)
+
+    def pack_json(self) -> bytes:
+        """Pack the clock into the JSON format used by earlier versions."""
         jsonified = {'uuid': self.uuid.hex()}
 
         for id in self.node_ids:
@@ -818,8 +1075,8 @@ class VectorPointClock:
         return bytes(json.dumps(jsonified, sort_keys=True, separators=(',', ':')), 'utf-8')
 
     @classmethod
-    def unpack(cls, data: bytes) -> VectorPointClock:
-        """Unpack a clock from bytes."""
+    def unpack_json(cls, data: bytes) -> VectorPointClock:
+        """Unpack a clock from the JSON format used by earlier versions."""
         tert(type(data) is bytes, 'data must be bytes')
 
         data = json.loads(str(data, 'utf-8'))
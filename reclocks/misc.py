@@ -1,4 +1,5 @@
 from hashlib import sha256, sha512
+from hmac import compare_digest
 from nacl.signing import SigningKey
 import nacl.bindings
 
@@ -16,6 +17,11 @@ def vert(condition: bool, message: str) -> None:
 # cryptography
 def clamp_scalar(scalar: bytes, from_private_key: bool = False) -> bytes:
     """Make a clamped ed25519 scalar by setting specific bits."""
+    if not from_private_key and type(scalar) is bytes and len(scalar) == 32 \
+            and scalar[31] < 0b10000000:
+        # bit 255 is already 0, e.g. for reduced scalars
+        return scalar
+
     if type(scalar) is bytes and len(scalar) >= 32:
         x_i = bytearray(scalar[:32])
     elif type(scalar) is SigningKey:
@@ -104,69 +110,56 @@ def recursive_next_hash_point(preimage: bytes, point: bytes, count: int) -> tupl
         hashed, point = next_hash_point(hashed, point)
     return (hashed, point)
 
-def sign_with_scalar(scalar: bytes, message: bytes, seed: bytes = None) -> bytes:
+def sign_with_scalar(scalar: bytes, message: bytes, seed: bytes = None,
+                     point: bytes = None) -> bytes:
     """Creates a valid signature given an ed25519 scalar that validates
-        with the corresponding point.
+        with the corresponding point. If the point for the scalar is
+        already known, it can be passed to skip deriving it again.
     """
     tert(type(scalar) is bytes, 'scalar must be bytes')
     tert(type(message) is bytes, 'message must be bytes')
+    tert(point is None or type(point) is bytes, 'point must be bytes or None')
 
     vert(nacl.bindings.crypto_core_ed25519_SCALARBYTES == len(scalar),
          'scalar must be a valid ed25519 scalar')
 
     seed = seed or H_small(scalar + message)
     x, m = scalar, message
-    X = nacl.bindings.crypto_scalarmult_ed25519_base_noclamp(x) # G^x
-    nonce = H_big(seed)[32:]
-    r = clamp_scalar(H_small(H_big(nonce, m))) # H(nonce || m)
+    X = point or nacl.bindings.crypto_scalarmult_ed25519_base_noclamp(x) # G^x
+    nonce = sha512(seed).digest()[32:]
+    r = nacl.bindings.crypto_core_ed25519_scalar_reduce(H_big(nonce, m)) # H(nonce || m)
     R = nacl.bindings.crypto_scalarmult_ed25519_base_noclamp(r) # G^r
-    c = clamp_scalar(H_small(R, X, m)) # H(R + T || X || m)
+    c = H_small(R, X, m) # H(R + T || X || m)
     s = nacl.bindings.crypto_core_ed25519_scalar_add(
         r, nacl.bindings.crypto_core_ed25519_scalar_mul(c, x)
     ) # r + H(R || X || m) * x
     return R + s
 
 # helper functions
-def xor(b1: bytes, b2: bytes) -> bytes:
-    """XOR two equal-length byte strings together."""
-    b3 = bytearray()
-    for i in range(len(b1)):
-        b3.append(b1[i] ^ b2[i])
-
-    return bytes(b3)
+_DISPLAYABLE_ASCII = bytes(range(32, 127))
 
 def bytes_are_same(b1: bytes, b2: bytes) -> bool:
     """Timing-attack safe bytes comparison."""
-    return len(b1) == len(b2) and int.from_bytes(xor(b1, b2), 'little') == 0
+    return compare_digest(b1, b2)
 
 def all_ascii(data: bytes) -> bool:
     """Determine if all bytes are displayable ascii chars."""
-    for c in data:
-        if c < 32 or c > 126:
-            return False
-
-    return True
+    return not data.translate(None, _DISPLAYABLE_ASCII)
 
 def hexify(data) -> dict:
     """Convert bytes to hex."""
+    data_type = type(data)
 
-    if type(data) is bytes and not all_ascii(data):
-        return data.hex()
+    if data_type is list:
+        return [hexify(v) for v in data]
 
-    if type(data) in (tuple, list):
-        result = []
-        for v in data:
-            result.append(hexify(v))
+    if data_type is tuple:
+        return tuple([hexify(v) for v in data])
 
-        return result if type(data) is list else tuple(result)
+    if data_type is dict:
+        return {hexify(key): hexify(value) for key, value in data.items()}
 
-    if type(data) is dict:
-        result = {}
-
-        for key in data:
-            name = hexify(key)
-            result[name] = hexify(data[key])
-
-        return result
+    if data_type is bytes and data and not all_ascii(data):
+        return data.hex()
 
     return data
@@ -5,6 +5,10 @@ import nacl.bindings
 import unittest
 
 
+# order of the ed25519 prime-order subgroup
+L = 2**252 + 27742317777372353535851937790883648493
+
+
 class RunMathematicalProofs(unittest.TestCase):
     """Prove some maths to demonstrate insecurity of constructions."""
     def test_prove_point_can_be_divided_by_two(self):
@@ -16,6 +20,23 @@ class RunMathematicalProofs(unittest.TestCase):
         Y_2 = divide_point_by_two(Y2)
         assert Y == Y_2, f'\n{Y.hex()}\n{Y_2.hex()}'
 
+    def test_recursive_add_point_matches_repeated_addition(self):
+        point = misc.derive_point_from_scalar(misc.derive_key_from_seed(token_bytes(32)))
+        expected = point
+        for count in range(1, 300):
+            expected = nacl.bindings.crypto_core_ed25519_add(expected, expected)
+            if count < 10 or count % 50 == 0:
+                assert recursive_add_point(point, count) == expected
+        assert recursive_add_point(point, 0) == point
+
+    def test_recursive_add_scalar_matches_repeated_addition(self):
+        scalar = misc.H_small(token_bytes(32))
+        expected = scalar
+        for count in range(1, 300):
+            expected = nacl.bindings.crypto_core_ed25519_scalar_add(expected, expected)
+            assert recursive_add_scalar(scalar, count) == expected
+        assert recursive_add_scalar(scalar, 0) == scalar
+
 
 def recursive_add_point(point: bytes, count: int) -> bytes:
     """Function to recursively add an ed25519 point to itself."""
@@ -26,10 +47,15 @@ def recursive_add_point(point: bytes, count: int) -> bytes:
     misc.vert(nacl.bindings.crypto_core_ed25519_is_valid_point(point),
          'point must be a valid ed25519 point')
 
-    for _ in range(count):
-        point = nacl.bindings.crypto_core_ed25519_add(point, point)
+    if count < 6:
+        # a few doublings are cheaper than one scalar multiplication
+        for _ in range(count):
+            point = nacl.bindings.crypto_core_ed25519_add(point, point)
+        return point
 
-    return point
+    # valid points are in the prime-order subgroup, so 2^count reduces mod L
+    multiplier = pow(2, count, L).to_bytes(32, 'little')
+    return nacl.bindings.crypto_scalarmult_ed25519_noclamp(multiplier, point)
 
 def recursive_add_scalar(scalar: bytes, count: int) -> bytes:
     """Function to recursively add an ed25519 scalar to itself."""
@@ -40,10 +66,12 @@ def recursive_add_scalar(scalar: bytes, count: int) -> bytes:
     misc.vert(nacl.bindings.crypto_core_ed25519_SCALARBYTES == len(scalar),
          'scalar must be a valid ed25519 scalar')
 
-    for _ in range(count):
-        scalar = nacl.bindings.crypto_core_ed25519_scalar_add(scalar, scalar)
+    if count == 0:
+        return scalar
 
-    return scalar
+    # adding a scalar to itself count times multiplies it by 2^count
+    multiplier = pow(2, count, L).to_bytes(32, 'little')
+    return nacl.bindings.crypto_core_ed25519_scalar_mul(scalar, multiplier)
 
 def divide_point_by_two(point: bytes) -> bytes:
     """Divides a point by the scalar equivalent of 2.
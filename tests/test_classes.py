@@ -1,7 +1,9 @@
+from dataclasses import asdict
 from hashlib import sha256
 from secrets import token_bytes
 from context import classes, interfaces, misc
 import unittest
+import weakref
 
 
 class TestHashClock(unittest.TestCase):
@@ -150,6 +152,42 @@ class TestHashClock(unittest.TestCase):
         for i, v in enumerate(clock1.state):
             assert v == unpacked.state[i], 'all state items should match'
 
+    def test_unpacked_clock_verifies_and_updates_from_unpacked_state(self):
+        clock1 = classes.HashClock()
+        clockupdater1 = clock1.setup(2000)
+        clock1.update(clockupdater1.advance(1500))
+        unpacked = classes.HashClock.unpack(clock1.pack())
+
+        assert unpacked.verify()
+        assert unpacked.verify_timestamp(clockupdater1.advance(1600))
+        assert not unpacked.verify_timestamp((1600, token_bytes(32)))
+        unpacked.update(clockupdater1.advance(1700))
+        assert unpacked.read() == clockupdater1.advance(1700)
+        assert unpacked.verify()
+
+    def test_supports_weakrefs_and_extra_attributes(self):
+        clock1 = classes.HashClock()
+        clockupdater1 = clock1.setup(5)
+        vector = classes.VectorHashClock()
+        vector.setup([b'123'])
+
+        for item in (clock1, clockupdater1, vector):
+            assert weakref.ref(item)() is item
+            item.note = 'app-specific data'
+            assert item.note == 'app-specific data'
+
+    def test_asdict_round_trips_through_init(self):
+        clock1 = classes.HashClock()
+        clockupdater1 = clock1.setup(2000)
+        clock1.update(clockupdater1.advance(1500))
+        clock1 = classes.HashClock.unpack(clock1.pack())
+        assert clock1.verify()
+
+        clock2 = classes.HashClock(**asdict(clock1))
+        assert set(asdict(clock1)) == {'uuid', 'state', 'updater'}
+        assert clock2 == clock1
+        assert clock2.verify()
+
     def test_verify_returns_True_for_valid_state(self):
         clock1 = classes.HashClock()
         assert clock1.verify(), 'verify() should return True for valid state'
@@ -176,6 +214,39 @@ class TestHashClock(unittest.TestCase):
         assert clock1.verify_timestamp(ts)
         assert not clock1.verify_timestamp((1, token_bytes(32)))
 
+    def test_verify_and_update_work_across_checkpoints(self):
+        clock1 = classes.HashClock()
+        clockupdater1 = clock1.setup(2100)
+        clock1.update(clockupdater1.advance(2050))
+        assert clock1.read()[0] == 2050
+        assert clock1.verify()
+
+        assert clock1.verify_timestamp(clockupdater1.advance(1500))
+        assert clock1.verify_timestamp(clockupdater1.advance(2048))
+        assert not clock1.verify_timestamp((1500, token_bytes(32)))
+        assert not clock1.verify_timestamp((2048, token_bytes(32)))
+
+        clock1.update(clockupdater1.advance(2051))
+        assert clock1.read()[0] == 2051
+        assert clock1.verify()
+
+        clock1.state = (clock1.state[0], token_bytes(32))
+        assert not clock1.verify(), 'verify() should return False for invalid state'
+
+    def test_checkpoints_never_hold_states_after_current_time(self):
+        clock1 = classes.HashClock()
+        clockupdater1 = clock1.setup(3000)
+        assert max(clock1._checkpoints, default=0) <= clock1.read()[0]
+
+        for time in (1, 1000, 2500):
+            assert clock1.verify_timestamp(clockupdater1.advance(time))
+            assert not clock1.verify_timestamp((time, token_bytes(32)))
+            assert max(clock1._checkpoints, default=0) <= clock1.read()[0]
+
+        clock1.update(clockupdater1.advance(2049))
+        assert max(clock1._checkpoints) <= clock1.read()[0]
+        assert clockupdater1.seed not in clock1._checkpoints.values()
+
     def test_can_be_updated_returns_True_for_terminated_clock_with_setup_seed_32(self):
         clock1 = classes.HashClock()
         clockupdater1 = clock1.setup(1, seed_size=32)
@@ -253,6 +324,37 @@ class TestHashClockUpdater(unittest.TestCase):
         assert clockupdater.seed == unpacked.seed
         assert clockupdater.max_time == unpacked.max_time
 
+    def test_HashClockUpdater_asdict_round_trips_through_init(self):
+        clockupdater = classes.HashClockUpdater.setup(token_bytes(16), 3000)
+        clockupdater.advance(1500)
+        copied = classes.HashClockUpdater(**asdict(clockupdater))
+
+        assert set(asdict(clockupdater)) == {'seed', 'uuid', 'max_time'}
+        assert copied == clockupdater
+        for time in (0, 1500, 3000):
+            assert copied.advance(time) == clockupdater.advance(time)
+
+    def test_HashClockUpdater_advance_works_across_checkpoints(self):
+        seed = token_bytes(16)
+        clockupdater = classes.HashClockUpdater.setup(seed, 3000)
+        unpacked = classes.HashClockUpdater.unpack(clockupdater.pack())
+
+        times = [-5, 0, 1, 951, 952, 953, 1976, 2999, 3000]
+        for time in times + times[::-1]:
+            expected = (time, misc.recursive_hash(seed, 3000 - time))
+            assert clockupdater.advance(time) == expected
+            assert unpacked.advance(time) == expected
+
+    def test_HashClockUpdater_advance_follows_changes_to_seed_and_max_time(self):
+        clockupdater = classes.HashClockUpdater.setup(b'a' * 16, 3000)
+        assert clockupdater.advance(50) == (50, misc.recursive_hash(b'a' * 16, 2950))
+
+        clockupdater.seed = b'b' * 16
+        assert clockupdater.advance(50) == (50, misc.recursive_hash(b'b' * 16, 2950))
+
+        clockupdater.max_time = 2000
+        assert clockupdater.advance(50) == (50, misc.recursive_hash(b'b' * 16, 1950))
+
 
 class TestVectorHashClock(unittest.TestCase):
     """Test suite for VectorHashClock."""
@@ -350,6 +452,34 @@ class TestVectorHashClock(unittest.TestCase):
         assert type(update[node_ids[0]][1]) is bytes, \
             'advance() dict must map node_id to tuple[int, bytes'
 
+    def test_update_rejects_invalid_node_ids(self):
+        node_ids = [b'123', b'321']
+        vectorclock = classes.VectorHashClock().setup(node_ids)
+        update = vectorclock.read()
+        update[b'456'] = update[node_ids[0]]
+
+        with self.assertRaises(ValueError) as e:
+            vectorclock.update(update)
+        assert str(e.exception) == 'state includes invalid node_id'
+
+    def test_first_state_of_node_is_recorded_as_verified(self):
+        node_ids = [b'123', b'321']
+        vectorclock1 = classes.VectorHashClock().setup(node_ids)
+        vectorclock2 = classes.VectorHashClock(vectorclock1.uuid).setup(node_ids)
+        clock = classes.HashClock()
+        clockupdater = clock.setup(5)
+        state = clockupdater.advance(2)
+        update = vectorclock1.advance(node_ids[0], state)
+        vectorclock2.update(update)
+
+        for vectorclock in (vectorclock1, vectorclock2):
+            assert vectorclock.clocks[node_ids[0]].uuid == clock.uuid
+            assert vectorclock.clocks[node_ids[0]]._checkpoints == {0: clock.uuid, 2: state[1]}
+            assert vectorclock.verify()
+
+        vectorclock2.update(vectorclock2.advance(node_ids[0], clockupdater.advance(3)))
+        assert vectorclock2.read()[node_ids[0]] == clockupdater.advance(3)
+
     def test_update_accepts_advance_output_and_advances_clock(self):
         node_ids = [b'123', b'321']
         vectorclock = classes.VectorHashClock().setup(node_ids)
@@ -542,6 +672,38 @@ class TestVectorHashClock(unittest.TestCase):
         assert unpacked.uuid == vectorclock.uuid, 'unpacked must have same uuid as source vectorclock'
         assert vectorclock.are_concurrent(vectorclock.read(), unpacked.read()), \
             'timestamps must be concurrent between unpacked and source vectorclock'
+        assert unpacked.read() == vectorclock.read(), 'unpacked must have same state'
+
+        with self.assertRaises(ValueError) as e:
+            classes.VectorHashClock.unpack(packed[:-1])
+        assert str(e.exception) == 'data is truncated'
+
+        with self.assertRaises(ValueError) as e:
+            classes.VectorHashClock.unpack(vectorclock.pack_json())
+        assert str(e.exception) == 'data is not a packed vector clock'
+
+    def test_pack_rejects_fields_too_long_to_encode(self):
+        vectorclock = classes.VectorHashClock().setup([b'1' * 0x10000])
+
+        with self.assertRaises(ValueError) as e:
+            vectorclock.pack()
+        assert str(e.exception) == \
+            'uuid, node_ids, and packed clocks must be at most 65535 bytes'
+
+    def test_pack_json_and_unpack_json_round_trip(self):
+        node_ids = [b'123', b'321']
+        vectorclock = classes.VectorHashClock().setup(node_ids)
+        clock = classes.HashClock()
+        clock.setup(2)
+        vectorclock.clocks[node_ids[0]] = clock
+        packed = vectorclock.pack_json()
+        unpacked = classes.VectorHashClock.unpack_json(packed)
+
+        assert type(packed) is bytes, 'pack_json() must return bytes'
+        assert isinstance(unpacked, classes.VectorHashClock), \
+            'unpack_json() must return a VectorHashClock'
+        assert unpacked.uuid == vectorclock.uuid, 'unpacked must have same uuid as source vectorclock'
+        assert unpacked.read() == vectorclock.read(), 'unpacked must have same state'
 
 
 class TestPointClockUpdater(unittest.TestCase):
@@ -595,12 +757,30 @@ class TestPointClockUpdater(unittest.TestCase):
         assert type(timestamp[1]) is bytes and len(timestamp[1]) == 32
         assert type(timestamp[2]) is bytes and len(timestamp[2]) == 64
 
+    def test_advance_follows_changes_to_seed(self):
+        clockupdater = classes.PointClockUpdater.setup(token_bytes(16), 2)
+        clockupdater.advance(1)
+
+        seed = token_bytes(16)
+        vkey = misc.derive_point_from_scalar(misc.derive_key_from_seed(misc.H_small(seed)))
+        clockupdater.seed = seed
+        assert clockupdater.advance(2)[1] == vkey
+        assert clockupdater.advance_and_sign(2, b'hello world')[1] == vkey
+
     def test_pack_returns_bytes(self):
         clockupdater = classes.PointClockUpdater.setup(token_bytes(16), 3)
         packed = clockupdater.pack()
 
         assert type(packed) is bytes, 'pack() must return bytes'
 
+    def test_asdict_round_trips_through_init(self):
+        clockupdater = classes.PointClockUpdater.setup(token_bytes(16), 3)
+        copied = classes.PointClockUpdater(**asdict(clockupdater))
+
+        assert set(asdict(clockupdater)) == {'seed', 'uuid', 'max_time'}
+        assert copied == clockupdater
+        assert copied.advance(1) == clockupdater.advance(1)
+
     def test_unpack_returns_instance_with_same_values(self):
         clockupdater = classes.PointClockUpdater.setup(token_bytes(16), 3)
         packed = clockupdater.pack()
@@ -734,6 +914,29 @@ class TestPointClock(unittest.TestCase):
         for i, v in enumerate(clock1.state):
             assert v == unpacked.state[i], 'all state items should match'
 
+    def test_asdict_round_trips_through_init(self):
+        clock1 = classes.PointClock()
+        clockupdater1 = clock1.setup(5)
+        clock1.update(clockupdater1.advance(3))
+        clock1 = classes.PointClock.unpack(clock1.pack())
+        assert clock1.verify()
+
+        clock2 = classes.PointClock(**asdict(clock1))
+        assert set(asdict(clock1)) == {'uuid', 'state', 'updater'}
+        assert clock2 == clock1
+        assert clock2.verify()
+
+    def test_supports_weakrefs_and_extra_attributes(self):
+        clock1 = classes.PointClock()
+        clockupdater1 = clock1.setup(5)
+        vector = classes.VectorPointClock()
+        vector.setup([b'123'])
+
+        for item in (clock1, clockupdater1, vector):
+            assert weakref.ref(item)() is item
+            item.note = 'app-specific data'
+            assert item.note == 'app-specific data'
+
     def test_verify_returns_True_for_valid_state(self):
         clock1 = classes.PointClock()
         assert clock1.verify(), 'verify() should return True for valid state'
@@ -772,6 +975,35 @@ class TestPointClock(unittest.TestCase):
             message + b'123'
         )
 
+    def test_verify_timestamp_works_around_latest_verified_state(self):
+        clock1 = classes.PointClock()
+        clockupdater1 = clock1.setup(5)
+        clock1.update(clockupdater1.advance(2))
+        clock1.update(clockupdater1.advance(4))
+        assert clock1.read()[0] == 4
+        assert clock1.verify()
+
+        assert clock1.verify_timestamp(clockupdater1.advance(3))
+        assert clock1.verify_timestamp(clockupdater1.advance(5))
+        assert not clock1.verify_timestamp((5, clockupdater1.advance(4)[1]))
+
+        clock1.state = (4, clockupdater1.advance(3)[1])
+        assert not clock1.verify(), 'verify() should return False for invalid state'
+
+    def test_verify_signatures_returns_True_only_if_all_signatures_verify(self):
+        clock1 = classes.PointClock()
+        clockupdater1 = clock1.setup(5)
+        messages = [b'hello', b'world', b'!']
+        items = [
+            clockupdater1.advance_and_sign(i+1, m)[1:] for i, m in enumerate(messages)
+        ]
+        items = [(point, m, sig) for (point, sig), m in zip(items, messages)]
+        assert classes.PointClock.verify_signatures(items)
+        assert classes.PointClock.verify_signatures([])
+
+        items[1] = (items[1][0], b'tampered', items[1][2])
+        assert not classes.PointClock.verify_signatures(items)
+
 
 class TestVectorPointClock(unittest.TestCase):
     """Test suite for VectorPointClock."""
@@ -861,6 +1093,34 @@ class TestVectorPointClock(unittest.TestCase):
         assert type(timestamp[node_ids[0]][1]) is bytes, \
             'advance() dict must map node_id to tuple[int, bytes'
 
+    def test_update_rejects_invalid_node_ids(self):
+        node_ids = [b'123', b'321']
+        vectorclock = classes.VectorPointClock().setup(node_ids)
+        timestamp = vectorclock.read()
+        timestamp[b'456'] = timestamp[node_ids[0]]
+
+        with self.assertRaises(ValueError) as e:
+            vectorclock.update(timestamp)
+        assert str(e.exception) == 'state includes invalid node_id'
+
+    def test_first_state_of_node_is_recorded_as_verified(self):
+        node_ids = [b'123', b'321']
+        vectorclock1 = classes.VectorPointClock().setup(node_ids)
+        vectorclock2 = classes.VectorPointClock(vectorclock1.uuid).setup(node_ids)
+        clock = classes.PointClock()
+        clockupdater = clock.setup(5)
+        state = clockupdater.advance(2)
+        update = vectorclock1.advance(node_ids[0], state)
+        vectorclock2.update(update)
+
+        for vectorclock in (vectorclock1, vectorclock2):
+            assert vectorclock.clocks[node_ids[0]].uuid == clock.uuid
+            assert vectorclock.clocks[node_ids[0]]._anchor == (clock.uuid, 2, state[1])
+            assert vectorclock.verify()
+
+        vectorclock2.update(vectorclock2.advance(node_ids[0], clockupdater.advance(3)))
+        assert vectorclock2.read()[node_ids[0]] == clockupdater.advance(3)
+
     def test_update_accepts_advance_output_and_advances_clock(self):
         node_ids = [b'123', b'321']
         vectorclock = classes.VectorPointClock().setup(node_ids)
@@ -1053,6 +1313,47 @@ class TestVectorPointClock(unittest.TestCase):
         assert unpacked.uuid == vectorclock.uuid, 'unpacked must have same uuid as source vectorclock'
         assert vectorclock.are_concurrent(vectorclock.read(), unpacked.read()), \
             'timestamps must be concurrent between unpacked and source vectorclock'
+        assert unpacked.read() == vectorclock.read(), 'unpacked must have same state'
+
+        with self.assertRaises(ValueError) as e:
+            classes.VectorPointClock.unpack(packed[:-1])
+        assert str(e.exception) == 'data is truncated'
+
+        with self.assertRaises(ValueError) as e:
+            classes.VectorPointClock.unpack(vectorclock.pack_json())
+        assert str(e.exception) == 'data is not a packed vector clock'
+
+    def test_pack_json_and_unpack_json_round_trip(self):
+        node_ids = [b'123', b'321']
+        vectorclock = classes.VectorPointClock().setup(node_ids)
+        clock = classes.PointClock()
+        clock.setup(2)
+        vectorclock.clocks[node_ids[0]] = clock
+        packed = vectorclock.pack_json()
+        unpacked = classes.VectorPointClock.unpack_json(packed)
+
+        assert type(packed) is bytes, 'pack_json() must return bytes'
+        assert isinstance(unpacked, classes.VectorPointClock), \
+            'unpack_json() must return a VectorPointClock'
+        assert unpacked.uuid == vectorclock.uuid, 'unpacked must have same uuid as source vectorclock'
+        assert unpacked.read() == vectorclock.read(), 'unpacked must have same state'
+
+    def test_verify_signed_timestamp_returns_False_for_malformed_entries(self):
+        clocks = [classes.PointClock() for _ in range(2)]
+        updaters = [clock.setup(8) for clock in clocks]
+        node_ids = [clock.uuid for clock in clocks]
+        vectorclock = classes.VectorPointClock().setup(
+            node_ids, {nid: nid for nid in node_ids}
+        )
+        message = b'hello world'
+        update = vectorclock.advance(
+            node_ids[0], updaters[0].advance_and_sign(1, message)
+        )
+        assert vectorclock.verify_signed_timestamp(update, message)
+
+        for malformed in (None, b'not a tuple', [1, node_ids[1]]):
+            timestamp = {**update, node_ids[1]: malformed}
+            assert not vectorclock.verify_signed_timestamp(timestamp, message)
 
     def test_e2e_with_signatures(self):
         """This demonstrates a decent way to use this in practice."""
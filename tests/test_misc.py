@@ -0,0 +1,58 @@
+from secrets import token_bytes
+from context import misc
+from nacl.signing import VerifyKey
+import unittest
+
+
+class TestMisc(unittest.TestCase):
+    """Test suite for misc helper functions."""
+    def test_bytes_are_same_compares_bytes(self):
+        b1 = token_bytes(32)
+        assert misc.bytes_are_same(b1, bytes(b1))
+        assert not misc.bytes_are_same(b1, token_bytes(32))
+        assert not misc.bytes_are_same(b1, b1[:16])
+        assert not misc.bytes_are_same(b1, b1 + b'1')
+
+    def test_clamp_scalar_sets_and_clears_bits(self):
+        scalar = b'\xff' * 32
+        clamped = misc.clamp_scalar(scalar)
+        assert clamped == b'\xff' * 31 + b'\x7f'
+        assert misc.clamp_scalar(clamped) == clamped
+        assert misc.clamp_scalar(scalar + b'\xff') == clamped
+
+        clamped = misc.clamp_scalar(bytes(32), True)
+        assert clamped == bytes(31) + b'\x40'
+        clamped = misc.clamp_scalar(scalar, True)
+        assert clamped == b'\xf8' + b'\xff' * 30 + b'\x7f'
+
+        with self.assertRaises(ValueError):
+            misc.clamp_scalar(b'\x00' * 31)
+
+    def test_sign_with_scalar_accepts_known_point(self):
+        scalar = misc.derive_key_from_seed(token_bytes(32))
+        point = misc.derive_point_from_scalar(scalar)
+        message = b'hello world'
+        sig = misc.sign_with_scalar(scalar, message)
+        assert misc.sign_with_scalar(scalar, message, point=point) == sig
+        assert VerifyKey(point).verify(message, sig) == message
+
+        with self.assertRaises(TypeError) as e:
+            misc.sign_with_scalar(scalar, message, point=point.hex())
+        assert str(e.exception) == 'point must be bytes or None'
+
+    def test_all_ascii_detects_undisplayable_bytes(self):
+        assert misc.all_ascii(b'')
+        assert misc.all_ascii(b'uuid')
+        assert misc.all_ascii(bytes(range(32, 127)))
+        assert not misc.all_ascii(b'uuid\n')
+        assert not misc.all_ascii(b'\x7f')
+        assert not misc.all_ascii(b'\xff')
+
+    def test_hexify_converts_undisplayable_bytes_in_containers(self):
+        node_id = b'\x00\xff'
+        data = {b'uuid': node_id, node_id: (1, [node_id, b'ok', 2])}
+        assert misc.hexify(data) == {b'uuid': '00ff', '00ff': (1, ['00ff', b'ok', 2])}
+
+
+if __name__ == '__main__':
+    unittest.main()